@@ -1,10 +1,15 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import wave
 import os
 import pyaudio
 import threading
-import time
+import numpy as np
+import soundfile as sf
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional, NumPy reductions are used without it
+    njit = None
 
 
 class App:
@@ -26,6 +31,9 @@ class App:
         self.player = None
         self.init_gui_player()
 
+        self.player_drawn_position = None  # Last player position drawn on the waveform
+        self.window.after(33, self.tick_position)
+
     def close(self):
         """Handle application close event, including cleanup."""
         if tk.messagebox.askyesno("Exit", "Exit program?"):
@@ -77,6 +85,22 @@ class App:
         else:
             self.gui_player_play_pause.config(text="PLAY")
 
+    def tick_position(self):
+        """Draws the player position at ~30 Hz, independently of the audio block rate."""
+        self.window.after(33, self.tick_position)
+        if self.player is None:
+            return
+
+        try:
+            self.player.update()
+        except Exception as e:
+            messagebox.showerror("Error", f"AudioPlayer: {e}")
+
+        position = self.player.position_heard()
+        if position != self.player_drawn_position:
+            self.player_drawn_position = position
+            self.gui_waveform_canvas.draw_position(position)
+
     def run(self):
         """Start the Tkinter event loop."""
         self.window.mainloop()
@@ -100,7 +124,7 @@ class App:
 
         # Update the waveform display
         self.gui_waveform_canvas.draw_title(os.path.basename(path))
-        self.gui_waveform_canvas.draw_waveform(self.waveform.data)
+        self.gui_waveform_canvas.draw_waveform(self.waveform)
         self.gui_waveform_canvas.draw_position(0)
 
         # Initialize the audio player for the selected file
@@ -110,7 +134,6 @@ class App:
                 self.player.close() # Ensure any previous audio playback is stopped
             self.player = AudioPlayer(self)
             self.player.open(path)
-            self.player.start() # Start the audio player thread
         except Exception as e:
             messagebox.showerror("Error", f"AudioPlayer: {e}")
 
@@ -147,16 +170,82 @@ class App:
         self.player.repeat = self.gui_player_repeat_var.get()
 
 
+if njit is not None:
+    @njit("void(int16[:, :], int16[:, :], int64[:], int64, int16[:, :], int16[:, :])", parallel=True, cache=True)
+    def peaks_reduce_kernel(level_min, level_max, starts, end, out_min, out_max):
+        """Computes the min/max of each [starts[x], starts[x + 1]) range in a single pass."""
+        width = starts.shape[0]
+        for x in prange(width):
+            first = starts[x]
+            last = starts[x + 1] if x + 1 < width else end
+            lo0 = level_min[first, 0]
+            lo1 = level_min[first, 1]
+            hi0 = level_max[first, 0]
+            hi1 = level_max[first, 1]
+            for k in range(first + 1, last):
+                if level_min[k, 0] < lo0:
+                    lo0 = level_min[k, 0]
+                if level_min[k, 1] < lo1:
+                    lo1 = level_min[k, 1]
+                if level_max[k, 0] > hi0:
+                    hi0 = level_max[k, 0]
+                if level_max[k, 1] > hi1:
+                    hi1 = level_max[k, 1]
+            out_min[x, 0] = lo0
+            out_min[x, 1] = lo1
+            out_max[x, 0] = hi0
+            out_max[x, 1] = hi1
+
+    @njit("int16[:](uint8[:])", parallel=True, cache=True)
+    def decode_u8_kernel(samples):
+        """Centers unsigned 8-bit samples and scales them to the signed 16-bit range."""
+        out = np.empty(samples.shape[0], dtype=np.int16)
+        for i in prange(samples.shape[0]):
+            out[i] = (np.int16(samples[i]) - 128) << 8
+        return out
+
+
+def decode_u8(samples):
+    """Converts unsigned 8-bit samples to signed 16-bit samples."""
+    if njit is None:
+        return (samples.astype(np.int16) - 128) << 8
+    return decode_u8_kernel(samples)
+
+
+def peaks_reduce(level_min, level_max, starts, end):
+    """Reduces a peaks level into the (min, max) of each range starting at starts."""
+    width = len(starts)
+    if width == 0:
+        empty = np.zeros((0, 2), dtype=np.int16)
+        return empty, empty
+
+    if njit is None or not level_min.flags.writeable:
+        # The kernel is typed for writable arrays, raw samples may be read-only views or memory maps
+        out_min = np.minimum.reduceat(level_min[:end], starts, axis=0)
+        out_max = np.maximum.reduceat(level_max[:end], starts, axis=0)
+        return out_min, out_max
+
+    out_min = np.empty((width, 2), dtype=np.int16)
+    out_max = np.empty((width, 2), dtype=np.int16)
+    peaks_reduce_kernel(level_min, level_max, starts.astype(np.int64), end, out_min, out_max)
+    return out_min, out_max
+
+
 class Waveform:
     """Handles processing, validation, and storage of waveform data."""
 
+    # Sample width in bytes of the supported PCM subtypes
+    SAMPLE_WIDTHS = {"PCM_U8": 1, "PCM_16": 2}
+
     def __init__(self):
         self.path = None
-        self.data = None
+        self.data = None  # Samples as a (frames, 2) int16 array, one column per channel
         self.channels = 0
         self.width = 0
         self.rate = 0
         self.frames = 0
+        self.peaks = []
+        self.peak_abs = 0
 
     def close(self):
         """Resets waveform data and file properties."""
@@ -166,6 +255,8 @@ class Waveform:
         self.width = 0
         self.rate = 0
         self.frames = 0
+        self.peaks = []
+        self.peak_abs = 0
 
     def open(self, path):
         """Opens and processes the WAV file to extract stereo waveform data."""
@@ -173,50 +264,109 @@ class Waveform:
         self.path = path
 
         try:
-            with wave.open(self.path, 'r') as wav_file:
-                self.channels = wav_file.getnchannels()
-                self.width = wav_file.getsampwidth()
-                self.rate = wav_file.getframerate()
-                self.frames = wav_file.getnframes()
-
-                # Validate WAV parameters
-                if self.channels not in [1, 2]:
-                    raise ValueError("Unsupported number of channels.")
-                if self.width not in [1, 2]:
-                    raise ValueError("Unsupported sample width.")
-
-                # Read and process waveform data
-                frames = wav_file.readframes(self.frames)
-                raw_data = self.frames_normalize(frames)
-
-                # Mono
-                if self.channels == 1:
-                    # Convert by duplicating channels
-                    self.data = self.channels_normalize_from_mono(raw_data)
-                # Stereo
-                else:
-                    # Pair left and right channels
-                    self.data = self.channels_normalize_from_stereo(raw_data)
+            info = sf.info(self.path)
+            self.channels = info.channels
+            self.width = self.SAMPLE_WIDTHS.get(info.subtype, 0)
+            self.rate = info.samplerate
+            self.frames = info.frames
+
+            # Validate WAV parameters
+            if self.channels not in [1, 2]:
+                raise ValueError("Unsupported number of channels.")
+            if self.width not in [1, 2]:
+                raise ValueError("Unsupported sample width.")
+
+            if info.format == "WAV" and self.width == 2:
+                # Map the 16-bit samples in place as (frames, channels)
+                data = np.memmap(self.path, dtype='<i2', mode='r', offset=self.data_offset(), shape=(self.frames, self.channels))
+            elif info.format == "WAV" and self.width == 1:
+                # Decode the 8-bit samples in a single pass as (frames, channels)
+                samples = np.fromfile(self.path, dtype=np.uint8, count=self.frames * self.channels, offset=self.data_offset())
+                data = decode_u8(samples).reshape(-1, self.channels)
+            else:
+                # Read waveform data as (frames, channels) signed 16-bit samples
+                data, _ = sf.read(self.path, dtype='int16', always_2d=True)
+
+            # Mono
+            if self.channels == 1:
+                # Convert by duplicating channels, as a view without copying
+                self.data = np.broadcast_to(data, (self.frames, 2))
+            # Stereo
+            else:
+                self.data = data
+
+            self.peaks_build()
+            self.peak_abs = self.peaks_abs()
 
         except Exception as e:
             raise Exception(f"Error opening file: {e}")
 
-    def frames_normalize(self, frames):
-        """Converts raw frame data to integer values."""
-        if self.width == 1:
-            # 8-bit samples: unsigned, range 0-255, center by subtracting 128
-            return [x - 128 for x in frames]
-        elif self.width == 2:
-            # 16-bit samples: signed, range -32768 to 32767
-            return [int.from_bytes(frames[i:i + 2], 'little', signed=True) for i in range(0, len(frames), 2)]
-
-    def channels_normalize_from_stereo(self, data):
-        """Pairs stereo channels into tuples (L, R)."""
-        return [(data[i], data[i + 1]) for i in range(0, len(data), 2)]
+    def data_offset(self):
+        """Finds the byte offset of the samples in the WAV file's data chunk."""
+        with open(self.path, 'rb') as file:
+            header = file.read(12)
+            if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+                raise ValueError("Unsupported file format.")
+
+            # Walk the RIFF chunks, which are padded to an even size
+            while True:
+                chunk = file.read(8)
+                if len(chunk) < 8:
+                    raise ValueError("Missing data chunk.")
+                if chunk[:4] == b'data':
+                    return file.tell()
+                size = int.from_bytes(chunk[4:8], 'little')
+                file.seek(size + (size & 1), os.SEEK_CUR)
+
+    def peaks_build(self, size=2048, base=64, chunk=2 ** 20):
+        """Builds a pyramid of (decimation, min, max) peaks, halving the resolution at each level."""
+        self.peaks = []
+        if self.data.shape[0] < base:
+            return
 
-    def channels_normalize_from_mono(self, data):
-        """Converts mono data to stereo by duplicating each sample."""
-        return [(sample, sample) for sample in data]
+        # First level, streamed from the samples in chunks. Levels finer than
+        # base are skipped, they would take nearly as much memory as the samples
+        length = self.data.shape[0] // base
+        level_min = np.empty((length, 2), dtype=np.int16)
+        level_max = np.empty((length, 2), dtype=np.int16)
+        step = chunk // base
+        for start in range(0, length, step):
+            end = min(start + step, length)
+            block = self.data[start * base:end * base].reshape(-1, base, 2)
+            block.min(axis=1, out=level_min[start:end])
+            block.max(axis=1, out=level_max[start:end])
+        decimation = base
+        self.peaks.append((decimation, level_min, level_max))
+
+        # Following levels, from the previous one
+        while level_min.shape[0] > size:
+            even = level_min.shape[0] // 2 * 2
+            level_min = level_min[:even].reshape(-1, 2, 2).min(axis=1)
+            level_max = level_max[:even].reshape(-1, 2, 2).max(axis=1)
+            decimation *= 2
+            self.peaks.append((decimation, level_min, level_max))
+
+    def peaks_abs(self):
+        """Returns the largest sample magnitude, from the first peaks level and the frames past it."""
+        parts = []
+        covered = 0
+        if self.peaks:
+            decimation, level_min, level_max = self.peaks[0]
+            parts = [level_min, level_max]
+            covered = level_min.shape[0] * decimation
+        parts.append(self.data[covered:])
+        return max(max(-int(part.min(initial=0)), int(part.max(initial=0))) for part in parts)
+
+    def peaks_level(self, decimation):
+        """Returns the coarsest (min, max, decimation) level not coarser than the given decimation."""
+        level_min = level_max = self.data
+        level_decimation = 1
+        for peaks_decimation, peaks_min, peaks_max in self.peaks:
+            if peaks_decimation > decimation:
+                break
+            level_min, level_max = peaks_min, peaks_max
+            level_decimation = peaks_decimation
+        return level_min, level_max, level_decimation
 
 
 class WaveformCanvas:
@@ -228,78 +378,132 @@ class WaveformCanvas:
         self.canvas = tk.Canvas(window, bg="white", width=1200, height=400)
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        self.canvas_width = 1200  # Cached canvas width, updated on resize
+        self.canvas_height = 400  # Cached canvas height, updated on resize
+        self.view_start = 0  # First frame of the drawn range
+        self.view_end = 0  # End frame of the drawn range
+        self.frames_per_pixel = 1  # Cached number of frames per pixel
+
+        self.resize_job = None  # Pending debounced redraw
+        self.draw_cache = {"data": None, "key": None, "h": None, "peaks": None}  # Last drawn samples and their peaks
+
+        # Channel lines and their reusable coordinates buffers
+        self.channel_left_coords = np.empty(0, dtype=np.int32)
+        self.channel_right_coords = np.empty(0, dtype=np.int32)
+        self.channel_left_line = self.canvas.create_line(0, 0, 0, 0, fill="blue", tags="channel_left", state="hidden")
+        self.channel_right_line = self.canvas.create_line(0, 0, 0, 0, fill="green", tags="channel_right", state="hidden")
+
+        # Position indicator, created once and moved on updates
+        self.position_line = self.canvas.create_line(0, 0, 0, 0, fill="red", tags="position", state="hidden")
+
         self.canvas.bind("<Button-1>", self.action_click)
         self.canvas.bind("<Configure>", self.event_resize)
 
+    def scale_update(self, start=None, end=None):
+        """Recomputes the cached frames per pixel, optionally for a new drawn range."""
+        if start is not None:
+            self.view_start = start
+            self.view_end = end
+        self.frames_per_pixel = max(1, (self.view_end - self.view_start) // max(1, self.canvas_width))
+
     def draw_title(self, title):
         """Draws the title of the canvas."""
         self.canvas.delete("title")
         self.canvas.create_text(
-            self.canvas.winfo_width() // 2,
+            self.canvas_width // 2,
             10,
             text=f"{title}",
             fill="black",
             tags="title"
         )
 
-    def draw_waveform(self, data):
-        """Draws the waveform on the canvas."""
-        self.canvas.delete("channel_left")
-        self.canvas.delete("channel_right")
+    def draw_waveform(self, waveform):
+        """Draws the whole waveform on the canvas."""
+        self.draw_waveform_range(waveform, 0, waveform.data.shape[0])
+
+    def draw_waveform_range(self, waveform, start, end):
+        """Draws the frames from start to end of the waveform on the canvas."""
+        start = max(0, start)
+        end = min(end, waveform.data.shape[0])
+        self.scale_update(start, max(start, end))
+
+        # Skip the redraw when nothing changed, reuse the peaks when only the height did.
+        # The samples are compared by identity and held by the cache, since
+        # Waveform.open reloads the same object and a freed array's id can be reused
+        key = (self.canvas_width, self.view_start, self.view_end)
+        cache = self.draw_cache
+        cached = cache["data"] is waveform.data and cache["key"] == key
+        if cached and cache["h"] == self.canvas_height:
+            return
 
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
+        height = self.canvas_height
         mid_y = height // 2
 
-        # Calculate scaling factors
-        x_scale = max(1, len(data) // width)  # Downsample if necessary
-        y_scale = max(
-            1,
-            max(max(abs(left), abs(right)) for left, right in data) // (height // 2)
-        )  # Normalize amplitude
-
-        for x in range(0, width):
-            index = x * x_scale
-            if index < len(data):
-                left_amplitude = data[index][0] // y_scale
-                right_amplitude = data[index][1] // y_scale
-
-                # Draw left channel
-                self.canvas.create_line(
-                    x, mid_y, x, mid_y - left_amplitude, fill="blue", tags="channel_left"
-                )
-
-                # Draw right channel
-                self.canvas.create_line(
-                    x, mid_y, x, mid_y + right_amplitude, fill="green", tags="channel_right"
-                )
+        # Number of samples covered by each pixel
+        x_scale = self.frames_per_pixel
+        width = min(self.canvas_width, (self.view_end - self.view_start) // x_scale)
 
-    def draw_position(self, position):
-        """Updates the position indicator on the waveform."""
-        self.canvas.delete("position")
+        if cached:
+            peaks = cache["peaks"]
+        else:
+            # Reduce the nearest pyramid level into per-pixel ranges, keeping
+            # the pixel boundaries within 1/8 of a pixel of the exact positions
+            level_min, level_max, decimation = waveform.peaks_level(x_scale // 8)
+            starts = (start + np.arange(width) * x_scale) // decimation
+            stop = (start + width * x_scale) // decimation
+            peaks_neg, peaks_pos = peaks_reduce(level_min, level_max, starts, stop)
+
+            # Peak amplitude of each pixel, per channel, kept in int16 by
+            # taking ~min (-min - 1) which cannot overflow like -min would
+            peaks = np.maximum(peaks_pos, np.invert(peaks_neg))
+            cache["data"] = waveform.data
+            cache["key"] = key
+            cache["peaks"] = peaks
+        cache["h"] = height
+
+        # Normalize amplitude by the smallest power-of-two that fits the peak in half the height
+        y_shift = (waveform.peak_abs // max(1, mid_y)).bit_length()
+        peaks = np.right_shift(peaks, y_shift)
+
+        if width == 0:
+            self.canvas.itemconfigure(self.channel_left_line, state="hidden")
+            self.canvas.itemconfigure(self.channel_right_line, state="hidden")
+            return
 
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
+        # Grow the coordinates buffers on enlargement, the x of pixel x is x
+        if len(self.channel_left_coords) < 4 * width:
+            self.channel_left_coords = np.empty(4 * width, dtype=np.int32)
+            self.channel_left_coords[0::4] = self.channel_left_coords[2::4] = np.arange(width)
+            self.channel_right_coords = self.channel_left_coords.copy()
+
+        # Each pixel is a vertical segment from the middle line to its peak
+        coords_left = self.channel_left_coords[:4 * width]
+        coords_right = self.channel_right_coords[:4 * width]
+        coords_left[1::4] = coords_right[1::4] = mid_y
+        np.subtract(mid_y, peaks[:, 0], out=coords_left[3::4])
+        np.add(mid_y, peaks[:, 1], out=coords_right[3::4])
+
+        # Draw left and right channels
+        self.canvas.coords(self.channel_left_line, *coords_left.tolist())
+        self.canvas.coords(self.channel_right_line, *coords_right.tolist())
+        self.canvas.itemconfigure(self.channel_left_line, state="normal")
+        self.canvas.itemconfigure(self.channel_right_line, state="normal")
 
+    def draw_position(self, position):
+        """Updates the position indicator on the waveform."""
         if self.app.waveform:
-            x_scale = max(1, len(self.app.waveform.data) // width)  # Downsample if necessary
-            position_x = (position+1) // x_scale
-            self.canvas.create_line(
-                position_x, 0, position_x, height, fill="red", tags="position"
-            )
+            position_x = (position - self.view_start + 1) // self.frames_per_pixel
+            self.canvas.coords(self.position_line, position_x, 0, position_x, self.canvas_height)
+            self.canvas.itemconfigure(self.position_line, state="normal")
 
     def action_click(self, event):
         """Sets the audio player position based on a click event."""
         if self.app.waveform is None or self.app.player is None:
             return
 
-        # Get the waveform data length and canvas width
-        data_length = len(self.app.waveform.data)
-        canvas_width = self.canvas.winfo_width()
-
         # Calculate the new position in the audio data
         click_x = event.x
-        position = int((click_x / canvas_width) * data_length)
+        position = self.view_start + int((click_x / self.canvas_width) * (self.view_end - self.view_start))
 
         # Set the player's position
         self.app.player.file_position(position)
@@ -308,69 +512,92 @@ class WaveformCanvas:
         self.draw_position(position)
 
     def event_resize(self, event):
-        """Handles resizing of the canvas."""
-        print("RESIZE")
+        """Handles resizing of the canvas, coalescing bursts of events into one redraw."""
+        self.canvas_width = event.width
+        self.canvas_height = event.height
+        self.scale_update()
+
+        if self.resize_job is not None:
+            self.canvas.after_cancel(self.resize_job)
+        self.resize_job = self.canvas.after(75, self.event_resize_redraw)
+
+    def event_resize_redraw(self):
+        """Redraws the waveform once resizing has settled."""
+        self.resize_job = None
         if self.app.waveform is not None and self.app.waveform.data is not None:
-            self.draw_waveform(self.app.waveform.data)  # Redraw waveform
+            self.draw_waveform_range(self.app.waveform, self.view_start, self.view_end)  # Redraw waveform
 
-class AudioPlayer(threading.Thread):
-    """Handles playing of WAV files using PyAudio."""
+class AudioPlayer:
+    """Handles playing of WAV files using PyAudio, fed from PortAudio's own callback thread."""
 
-    def __init__(self, app):
-        super().__init__()
+    def __init__(self, app, frames_per_buffer=4096):
         self.app = app
 
         self.file = None
         self.pyaudio = None
         self.stream = None
+        self.frames_per_buffer = frames_per_buffer  # Frames requested by each stream callback
+        self.frame_size = 0  # Bytes per frame, all channels
+        self.rate = 0  # Frames per second
 
         self.playing = False  # Indicates if the audio is currently playing
         self.repeat = False  # Indicates if the audio is currently playing on repeat mode
-        self.position = 0  # Start position of audio playback
+        self.position = 0  # Current position of audio playback, in frames
+        self.block_clock = None  # (position, stream time) at which the last read block starts playing
+        self.file_lock = threading.Lock()  # Guards the file between the stream callback and the GUI
+        self.stream_finished = threading.Event()  # Set by the stream callback at the end of the file
+        self.error = None  # Error raised in the stream callback, reported by update
 
     def file_open(self, path):
-        """Opens the WAV file."""
+        """Opens the WAV file, decoded as signed 16-bit samples."""
         try:
-            self.file = wave.open(path, 'r')
+            self.file = sf.SoundFile(path)
+            self.frame_size = 2 * self.file.channels
+            self.rate = self.file.samplerate
+            self.position = 0
         except Exception as e:
             raise Exception(f"Error loading file: {e}")
 
     def file_read(self, num_frames):
         """Reads a specified number of frames from the file."""
-        if self.file is None:
-            return None
+        with self.file_lock:
+            if self.file is None:
+                return None
 
-        try:
-            return self.file.readframes(num_frames)
-        except Exception as e:
-            raise Exception(f"Error reading file: {e}")
-
-    def file_position(self, position=None):
-        """Gets or sets the current file position."""
-        if self.file is None:
-            return 0
-
-        if position is not None:
             try:
-                max_position = self.file.getnframes()
-                position = max(0, min(position, max_position))
-                self.file.setpos(position)
+                data = bytes(self.file.buffer_read(num_frames, dtype='int16'))
+                self.position += len(data) // self.frame_size
+                return data
             except Exception as e:
-                raise Exception(f"Error writing file position: {e}")
+                raise Exception(f"Error reading file: {e}")
 
-        try:
-            return self.file.tell()
-        except Exception as e:
-            raise Exception(f"Error reading file position: {e}")
+    def file_position(self, position=None):
+        """Gets or sets the current file position."""
+        with self.file_lock:
+            if self.file is None:
+                return 0
+
+            if position is not None:
+                try:
+                    max_position = self.file.frames
+                    position = max(0, min(position, max_position))
+                    self.position = self.file.seek(position)
+                    self.block_clock = None
+                except Exception as e:
+                    raise Exception(f"Error writing file position: {e}")
+
+            # Kept up to date by reads and seeks, so the file is not queried
+            return self.position
 
     def file_close(self):
         """Closes the WAV file."""
-        if self.file is not None:
-            try:
-                self.file.close()
-                self.file = None
-            except Exception as e:
-                raise Exception(f"Error closing file: {e}")
+        with self.file_lock:
+            if self.file is not None:
+                try:
+                    self.file.close()
+                    self.file = None
+                except Exception as e:
+                    raise Exception(f"Error closing file: {e}")
 
     def stream_open(self):
         """Opens the PyAudio stream."""
@@ -386,22 +613,79 @@ class AudioPlayer(threading.Thread):
         if self.stream is None:
             try:
                 self.stream = self.pyaudio.open(
-                    format=self.pyaudio.get_format_from_width(self.file.getsampwidth()),
-                    channels=self.file.getnchannels(),
-                    rate=self.file.getframerate(),
-                    output=True)
+                    format=pyaudio.paInt16,
+                    channels=self.file.channels,
+                    rate=self.file.samplerate,
+                    output=True,
+                    frames_per_buffer=self.frames_per_buffer,
+                    stream_callback=self.stream_callback,
+                    start=False)
             except Exception as e:
                 raise Exception(f"Error loading stream: {e}")
 
-    def stream_write(self, data):
-        """Writes data to the audio stream."""
+    def stream_callback(self, in_data, frame_count, time_info, status):
+        """Feeds the PyAudio stream from the file, called on the PortAudio thread."""
+        size = frame_count * self.frame_size
+        try:
+            # The block starts playing at its DAC time, or after the output latency if the host API gives none
+            start_time = time_info["output_buffer_dac_time"]
+            if not start_time:
+                start_time = time_info["current_time"] + self.stream.get_output_latency()
+            start_position = self.position
+            data = self.file_read(frame_count) or b""
+            self.block_clock = (start_position, start_time)
+
+            # End of file, wrap around on repeat, as often as a short file needs
+            while len(data) < size and self.repeat:
+                self.file_position(0)
+                block = self.file_read(frame_count - len(data) // self.frame_size)
+                if not block:
+                    break
+                data += block
+        except Exception as e:
+            self.error = e
+            self.stream_finished.set()
+            return b"", pyaudio.paAbort
+
+        if len(data) < size:
+            self.stream_finished.set()
+            return data, pyaudio.paComplete
+        return data, pyaudio.paContinue
+
+    def position_heard(self):
+        """Returns the position being heard, behind the read position by the frames still buffered."""
+        block_clock = self.block_clock
+        if not self.playing or self.stream is None or block_clock is None:
+            return self.position
+
+        start_position, start_time = block_clock
+        try:
+            heard = start_position + int((self.stream.get_time() - start_time) * self.rate)
+        except Exception:
+            return self.position
+        return max(0, min(heard, self.position))
+
+    def stream_start(self):
+        """Starts, or restarts after completion, the PyAudio stream."""
         if self.stream is None:
             return
 
         try:
-            self.stream.write(data)
+            if not self.stream.is_active():
+                self.stream.stop_stream()
+                self.stream.start_stream()
         except Exception as e:
-            raise Exception(f"Error writing to stream: {e}")
+            raise Exception(f"Error starting stream: {e}")
+
+    def stream_stop(self):
+        """Stops the PyAudio stream."""
+        if self.stream is None:
+            return
+
+        try:
+            self.stream.stop_stream()
+        except Exception as e:
+            raise Exception(f"Error stopping stream: {e}")
 
     def stream_close(self):
         """Stops and closes the PyAudio stream."""
@@ -422,6 +706,8 @@ class AudioPlayer(threading.Thread):
 
     def open(self, path):
         self.close()
+        self.stream_finished.clear()
+        self.error = None
         self.file_open(path)
         self.file_position(0)
         self.stream_open()
@@ -437,36 +723,33 @@ class AudioPlayer(threading.Thread):
             self.playing = False
             return
         self.playing = True
+        self.stream_start()
 
     def pause(self):
         """Pauses audio playback."""
         self.playing = False
+        self.stream_stop()
 
     def stop(self):
         """Stops audio playback and resets the position."""
-        self.playing = False
+        self.pause()
         self.file_position(0)
-        self.app.gui_waveform_canvas.draw_position(self.file_position())
 
-    def run(self):
-        """Plays the WAV file using PyAudio."""
+    def update(self):
+        """Handles the end of the file, called periodically from the GUI thread."""
+        if not self.stream_finished.is_set():
+            return
+        self.stream_finished.clear()
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            print(f"AudioPlayer: Error playing file: {error}")
+
+        # End of file or error, rewind and stop playing
         try:
-            while self.stream is not None:
-                if self.playing:
-                    data = self.file_read(1024)
-                    if (data is None) or (self.file.getnframes() == self.file_position()):
-                        self.file_position(0)
-                        self.playing = self.repeat
-                        self.app.update_gui_player_play_pause(self.playing)
-                    else:
-                        self.stream_write(data)
-                        self.file_position(self.file_position() + 1024)
-                    self.app.gui_waveform_canvas.draw_position(self.file_position())
-                else:
-                    time.sleep(0.1)
-        except Exception as e:
             self.stop()
-            print(f"AudioPlayer: Error playing file: {e}")
+        finally:
+            self.app.update_gui_player_play_pause(self.playing)
 
 if __name__ == "__main__":
     app = App()